@@ -1,51 +1,102 @@
 ﻿from __future__ import annotations
+import os
 import re
-from typing import Iterable
-from pint import UnitRegistry
+from functools import lru_cache
+from typing import NamedTuple
+
+from sof_app.core.exceptions import UnitMismatchError
 
 # -------------------------------
-# Registry & quantity factory
+# Backend selection
 # -------------------------------
-ureg = UnitRegistry(autoconvert_offset_to_baseunit=True)
-Q_ = ureg.Quantity
+# The default backend is a prebuilt conversion-factor table (below). Set
+# SOF_USE_PINT=1 to route parse/convert through pint instead (parity checks).
+_USE_PINT = os.getenv("SOF_USE_PINT", "").strip() == "1"
 
 # -------------------------------
-# Safe unit definitions (idempotent)
+# Conversion-factor table
 # -------------------------------
-def _safe_define(defn: str) -> None:
-    try:
-        ureg.define(defn)
-    except Exception:
-        # Ignore if already defined or alias collision
-        pass
-
-# Activity: curie + prefixes
-_safe_define("curie = 3.7e10 * becquerel = Ci")
-_safe_define("millicurie = 1e-3 curie = mCi")
-_safe_define("microcurie = 1e-6 curie = uCi = µCi")
-_safe_define("nanocurie = 1e-9 curie = nCi")
-_safe_define("picocurie = 1e-12 curie = pCi")
-
-# Common lab convenience
-_safe_define("dpm = 1/60 * becquerel = disintegrations_per_minute")
-_safe_define("dps = becquerel = disintegrations_per_second")
-
-# Dose: rem + mrem (Sv is built-in)
-_safe_define("rem = 0.01 sievert = rem")
-_safe_define("millirem = 1e-3 rem = mrem")
-# Ensure micro-sievert alias convenience
-_safe_define("microsievert = 1e-6 sievert = uSv = µSv")
-
-# Time: add yr alias
-_safe_define("year = 365.25 * day = yr")
-
-# Keep your dimensionless count (allowed to exist), but we'll block its use in conversion helpers.
-_safe_define("count = []")
+# unit text -> (base dimension, exponent, factor to SI base)
+# Activity and dose are kept as their own base dimensions so they never
+# silently convert into 1/time or J/kg.
+_UNIT_TABLE: dict[str, tuple[str, int, float]] = {
+    # Activity (SI: becquerel)
+    "Bq": ("activity", 1, 1.0), "becquerel": ("activity", 1, 1.0),
+    "mBq": ("activity", 1, 1e-3), "kBq": ("activity", 1, 1e3),
+    "MBq": ("activity", 1, 1e6), "GBq": ("activity", 1, 1e9), "TBq": ("activity", 1, 1e12),
+    "Ci": ("activity", 1, 3.7e10), "curie": ("activity", 1, 3.7e10),
+    "mCi": ("activity", 1, 3.7e7), "millicurie": ("activity", 1, 3.7e7),
+    "uCi": ("activity", 1, 3.7e4), "microcurie": ("activity", 1, 3.7e4),
+    "nCi": ("activity", 1, 3.7e1), "nanocurie": ("activity", 1, 3.7e1),
+    "pCi": ("activity", 1, 3.7e-2), "picocurie": ("activity", 1, 3.7e-2),
+    "dpm": ("activity", 1, 1.0 / 60.0), "disintegrations_per_minute": ("activity", 1, 1.0 / 60.0),
+    "dps": ("activity", 1, 1.0), "disintegrations_per_second": ("activity", 1, 1.0),
+    # Dose (SI: sievert; gray shares the dimension as in pint)
+    "Sv": ("dose", 1, 1.0), "sievert": ("dose", 1, 1.0),
+    "mSv": ("dose", 1, 1e-3), "millisievert": ("dose", 1, 1e-3),
+    "uSv": ("dose", 1, 1e-6), "microsievert": ("dose", 1, 1e-6),
+    "nSv": ("dose", 1, 1e-9),
+    "rem": ("dose", 1, 1e-2), "mrem": ("dose", 1, 1e-5), "millirem": ("dose", 1, 1e-5),
+    "Gy": ("dose", 1, 1.0), "gray": ("dose", 1, 1.0),
+    "mGy": ("dose", 1, 1e-3), "uGy": ("dose", 1, 1e-6),
+    # Time (SI: second)
+    "s": ("time", 1, 1.0), "sec": ("time", 1, 1.0), "second": ("time", 1, 1.0),
+    "ms": ("time", 1, 1e-3),
+    "min": ("time", 1, 60.0), "minute": ("time", 1, 60.0),
+    "h": ("time", 1, 3600.0), "hr": ("time", 1, 3600.0), "hour": ("time", 1, 3600.0),
+    "d": ("time", 1, 86400.0), "day": ("time", 1, 86400.0),
+    "week": ("time", 1, 7 * 86400.0),
+    "yr": ("time", 1, 365.25 * 86400.0), "year": ("time", 1, 365.25 * 86400.0),
+    "a": ("time", 1, 365.25 * 86400.0), "y": ("time", 1, 365.25 * 86400.0),
+    "annum": ("time", 1, 365.25 * 86400.0),
+    # Mass (SI: kilogram)
+    "kg": ("mass", 1, 1.0), "kilogram": ("mass", 1, 1.0),
+    "g": ("mass", 1, 1e-3), "gram": ("mass", 1, 1e-3),
+    "mg": ("mass", 1, 1e-6), "ug": ("mass", 1, 1e-9),
+    "t": ("mass", 1, 1e3), "tonne": ("mass", 1, 1e3),
+    # Length (SI: metre)
+    "m": ("length", 1, 1.0), "meter": ("length", 1, 1.0), "metre": ("length", 1, 1.0),
+    "km": ("length", 1, 1e3),
+    "cm": ("length", 1, 1e-2), "centimeter": ("length", 1, 1e-2),
+    "mm": ("length", 1, 1e-3), "millimeter": ("length", 1, 1e-3),
+    "um": ("length", 1, 1e-6),
+    "ft": ("length", 1, 0.3048), "foot": ("length", 1, 0.3048), "feet": ("length", 1, 0.3048),
+    "inch": ("length", 1, 0.0254),
+    # Volume (length**3)
+    "L": ("length", 3, 1e-3), "l": ("length", 3, 1e-3),
+    "liter": ("length", 3, 1e-3), "litre": ("length", 3, 1e-3),
+    "mL": ("length", 3, 1e-6), "ml": ("length", 3, 1e-6),
+    "uL": ("length", 3, 1e-9), "ul": ("length", 3, 1e-9),
+    "cc": ("length", 3, 1e-6),
+    # Dimensionless ratios
+    "%": ("", 0, 1e-2), "percent": ("", 0, 1e-2),
+    "ppm": ("", 0, 1e-6), "ppb": ("", 0, 1e-9),
+}
+
+# Units that take an SI prefix not already spelled out above (kCi, dm, ...).
+# Symbols take symbol prefixes; full names take full-name prefixes.
+_PREFIXABLE_SYMBOLS = {"Bq", "Ci", "Sv", "Gy", "rem", "s", "g", "m", "L", "l"}
+_PREFIXABLE_NAMES = {
+    "becquerel", "curie", "sievert", "gray", "second", "gram", "meter", "metre", "liter", "litre",
+}
+_SYMBOL_PREFIXES: dict[str, float] = {
+    "E": 1e18, "P": 1e15, "T": 1e12, "G": 1e9, "M": 1e6, "k": 1e3, "h": 1e2, "da": 1e1,
+    "d": 1e-1, "c": 1e-2, "m": 1e-3, "u": 1e-6, "n": 1e-9, "p": 1e-12, "f": 1e-15, "a": 1e-18,
+}
+_NAME_PREFIXES: dict[str, float] = {
+    "exa": 1e18, "peta": 1e15, "tera": 1e12, "giga": 1e9, "mega": 1e6, "kilo": 1e3,
+    "hecto": 1e2, "deca": 1e1, "deci": 1e-1, "centi": 1e-2, "milli": 1e-3, "micro": 1e-6,
+    "nano": 1e-9, "pico": 1e-12, "femto": 1e-15, "atto": 1e-18,
+}
+
+# Lexer for compound units: names, numbers, operators and parentheses
+_TOKEN_RE = re.compile(r"\*\*-?\d+|[*/()]|[A-Za-z_%]+|\d+(?:\.\d+)?")
 
 # -------------------------------
 # “Per 100 cm^2” bundle handling
 # -------------------------------
-SURFACE_AREA_BUNDLE = Q_(100, "centimeter**2")
+# 100 cm^2 expressed in m^2
+SURFACE_AREA_BUNDLE_M2 = 1e-2
 
 # Robust detector for a trailing “per 100 cm^2” token in compacted unit strings
 # Accepts variants like "/100cm^2", "/100cm**2" (we normalize ^→** earlier)
@@ -75,37 +126,220 @@ def _guard_counts(unit_text: str) -> None:
             "Convert counts → activity first using an efficiency (and geometry) model."
         )
 
+@lru_cache(maxsize=None)
+def _lookup_unit(name: str) -> tuple[str, int, float] | None:
+    """Resolve one unit name, allowing SI prefixes and plurals; None if unknown."""
+    candidates = [name]
+    if len(name) > 2 and name.endswith("s"):
+        candidates.append(name[:-1])  # hours, days, millicuries, ...
+    for cand in candidates:
+        if cand in _UNIT_TABLE:
+            return _UNIT_TABLE[cand]
+        for prefixes, bases in ((_SYMBOL_PREFIXES, _PREFIXABLE_SYMBOLS), (_NAME_PREFIXES, _PREFIXABLE_NAMES)):
+            for prefix, pf in prefixes.items():
+                rest = cand[len(prefix):]
+                if cand.startswith(prefix) and rest in bases:
+                    base, exp, f = _UNIT_TABLE[rest]
+                    return base, exp, f * pf
+    return None
+
+@lru_cache(maxsize=None)
+def _unit_info(unit_norm: str) -> tuple[tuple[tuple[str, int], ...], float]:
+    """
+    Resolve normalized unit text to (dimension, factor_to_SI).
+    Dimension is a sorted tuple of (base, exponent) pairs; '' is dimensionless.
+    Grammar (left-associative, as in pint): expr := term (('*'|'/') term)*,
+    term := atom ('**' int)?, atom := name | number | '(' expr ')'.
+    """
+    tokens = _TOKEN_RE.findall(unit_norm)
+    if "".join(tokens) != unit_norm:
+        raise ValueError(f"Cannot parse unit '{unit_norm}'")
+    if not tokens:
+        return (), 1.0
+    pos = 0
+
+    def peek() -> str:
+        return tokens[pos] if pos < len(tokens) else ""
+
+    def expr() -> tuple[dict[str, int], float]:
+        nonlocal pos
+        dims, factor = term()
+        while peek() in ("*", "/"):
+            sign = 1 if tokens[pos] == "*" else -1
+            pos += 1
+            d, f = term()
+            for k, v in d.items():
+                dims[k] = dims.get(k, 0) + sign * v
+            factor *= f ** sign
+        return dims, factor
+
+    def term() -> tuple[dict[str, int], float]:
+        nonlocal pos
+        dims, factor = atom()
+        if peek().startswith("**"):
+            power = int(tokens[pos][2:])
+            pos += 1
+            dims = {k: v * power for k, v in dims.items()}
+            factor **= power
+        return dims, factor
+
+    def atom() -> tuple[dict[str, int], float]:
+        nonlocal pos
+        tok = peek()
+        pos += 1
+        if tok == "(":
+            out = expr()
+            if peek() != ")":
+                raise ValueError(f"Cannot parse unit '{unit_norm}'")
+            pos += 1
+            return out
+        if tok[:1].isdigit():
+            return {}, float(tok)
+        if not tok or tok[0] in "*/)":
+            raise ValueError(f"Cannot parse unit '{unit_norm}'")
+        info = _lookup_unit(tok)
+        if info is None:
+            raise ValueError(f"Unknown unit '{tok}' in '{unit_norm}'")
+        base, exp, f = info
+        return ({base: exp} if exp else {}), f
+
+    dims, factor = expr()
+    if pos != len(tokens):
+        raise ValueError(f"Cannot parse unit '{unit_norm}'")
+    return tuple(sorted((k, v) for k, v in dims.items() if v)), factor
+
+class Quantity(NamedTuple):
+    """Lightweight value + unit pair backed by the conversion-factor table."""
+    magnitude: float
+    units: str
+
+    def to(self, target_unit: str) -> "Quantity":
+        target_norm = _normalize_unit_text(target_unit)
+        dim_s, f_s = _unit_info(self.units)
+        dim_t, f_t = _unit_info(target_norm)
+        if dim_s != dim_t:
+            raise UnitMismatchError(f"Cannot convert '{self.units}' to '{target_norm}'")
+        return Quantity(self.magnitude * f_s / f_t, target_norm)
+
+def _table_quantity(value: float, unit: str) -> Quantity:
+    unit_norm = _normalize_unit_text(unit)
+    _unit_info(unit_norm)  # fail fast on unknown units
+    return Quantity(float(value), unit_norm)
+
+# -------------------------------
+# Optional pint backend (SOF_USE_PINT=1)
+# -------------------------------
+@lru_cache(maxsize=1)
+def _pint_registry():
+    from pint import UnitRegistry
+
+    ureg = UnitRegistry(autoconvert_offset_to_baseunit=True)
+
+    def _safe_define(defn: str) -> None:
+        try:
+            ureg.define(defn)
+        except Exception:
+            # Ignore if already defined or alias collision
+            pass
+
+    # Activity: curie + prefixes
+    _safe_define("curie = 3.7e10 * becquerel = Ci")
+    _safe_define("millicurie = 1e-3 curie = mCi")
+    _safe_define("microcurie = 1e-6 curie = uCi = µCi")
+    _safe_define("nanocurie = 1e-9 curie = nCi")
+    _safe_define("picocurie = 1e-12 curie = pCi")
+    # Common lab convenience
+    _safe_define("dpm = 1/60 * becquerel = disintegrations_per_minute")
+    _safe_define("dps = becquerel = disintegrations_per_second")
+    # Dose: rem + mrem (Sv is built-in)
+    _safe_define("rem = 0.01 sievert = rem")
+    _safe_define("millirem = 1e-3 rem = mrem")
+    _safe_define("microsievert = 1e-6 sievert = uSv = µSv")
+    # Time: add yr alias
+    _safe_define("year = 365.25 * day = yr")
+    # Dimensionless count (allowed to exist), blocked in conversion helpers.
+    _safe_define("count = []")
+    return ureg
+
+def _pint_parse_quantity(value: float, unit: str):
+    ureg = _pint_registry()
+    unit_norm = _normalize_unit_text(unit)
+    _guard_counts(unit_norm)
+    if _BUNDLE_RE.search(unit_norm):
+        base_unit = _BUNDLE_RE.sub("", unit_norm)
+        q = ureg.Quantity(value, base_unit) / ureg.Quantity(100, "centimeter**2")
+        return q.to("becquerel / meter**2")
+    return ureg.Quantity(value, unit_norm)
+
+def _pint_convert_to(qty, target_unit: str):
+    target_norm = _normalize_unit_text(target_unit)
+    _guard_counts(str(qty.units))
+    _guard_counts(target_norm)
+    return qty.to(target_norm)
+
 # -------------------------------
 # Public helpers
 # -------------------------------
+def Q_(value: float, unit: str):
+    """Quantity factory for the active backend."""
+    if _USE_PINT:
+        return _pint_registry().Quantity(value, _normalize_unit_text(unit))
+    return _table_quantity(value, unit)
+
 def parse_quantity(value: float, unit: str):
     """
-    Parse a numeric value + unit string into a pint Quantity.
+    Parse a numeric value + unit string into a Quantity.
     - Accepts 'µ' and '^' power notation.
-    - Recognizes trailing '/100cm^2' or '/100cm**2' and converts to per m^2 using SURFACE_AREA_BUNDLE.
+    - Recognizes trailing '/100cm^2' or '/100cm**2' and converts to per m^2 using SURFACE_AREA_BUNDLE_M2.
     - Blocks counts/cpm/cps for safety (convert counts→activity separately).
     """
+    if _USE_PINT:
+        return _pint_parse_quantity(value, unit)
+
     unit_norm = _normalize_unit_text(unit)
 
     _guard_counts(unit_norm)
 
     if _BUNDLE_RE.search(unit_norm):
         base_unit = _BUNDLE_RE.sub("", unit_norm)  # remove the trailing bundle suffix
-        q = Q_(value, base_unit) / SURFACE_AREA_BUNDLE
-        # Preserve your original behavior: coerce to Bq/m^2
-        return q.to("becquerel / meter**2")
-    else:
-        return Q_(value, unit_norm)
+        q = _table_quantity(float(value) / SURFACE_AREA_BUNDLE_M2, base_unit + "/m**2")
+        # Preserve original behavior: coerce to Bq/m^2
+        return q.to("Bq/m**2")
+    return _table_quantity(value, unit_norm)
 
-def convert_to(qty: Q_, target_unit: str) -> Q_:
+def convert_to(qty, target_unit: str):
     """
     Convert a Quantity to a target unit while enforcing safety on counts.
+    Raises UnitMismatchError if the dimensions differ.
     """
+    if _USE_PINT:
+        return _pint_convert_to(qty, target_unit)
     target_norm = _normalize_unit_text(target_unit)
     _guard_counts(str(qty.units))
     _guard_counts(target_norm)
     return qty.to(target_norm)
 
+@lru_cache(maxsize=1024)
+def unit_factor(unit: str) -> tuple[object, float]:
+    """
+    Return (dimension, factor_to_SI) for a unit string, for bulk conversion.
+    Cached: repeated compute_sof calls reuse factors for units already seen.
+    Two units convert iff their dimensions are equal:
+        value_in_target = value * factor / target_factor
+    Honors the '/100cm^2' bundle and blocks counts, like parse_quantity.
+    """
+    unit_norm = _normalize_unit_text(unit)
+    _guard_counts(unit_norm)
+    if _USE_PINT:
+        q = _pint_parse_quantity(1.0, unit_norm).to_base_units()
+        return q.dimensionality, float(q.magnitude)
+    scale = 1.0
+    if _BUNDLE_RE.search(unit_norm):
+        unit_norm = _BUNDLE_RE.sub("", unit_norm) + "/m**2"
+        scale = 1.0 / SURFACE_AREA_BUNDLE_M2
+    dims, factor = _unit_info(unit_norm)
+    return dims, factor * scale
+
 # --------------- Optional: convenience lists for UIs/tests ----------------
 # These are safe, curated unit menus by category (you can import in your UIs).
 ACTIVITY_UNITS: list[str]   = ["Bq", "kBq", "MBq", "GBq", "TBq", "Ci", "mCi", "uCi", "nCi", "pCi", "dpm"]
@@ -1,8 +1,25 @@
 ﻿from __future__ import annotations
+from os import PathLike
+from pathlib import Path
+from typing import Optional
 import pandas as pd
 from sof_app.core.models import SampleRow, LimitEntry
 from sof_app.core.exceptions import SchemaError
 
+# Prefer the Rust-based calamine reader for Excel; fall back to pandas' default (openpyxl).
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except ImportError:  # pragma: no cover
+    _EXCEL_ENGINE = None
+
+# Arrow-backed columns when pyarrow is installed (faster string ops, ~3x smaller)
+try:
+    import pyarrow  # noqa: F401
+    _READ_KW = {"dtype_backend": "pyarrow"}
+except ImportError:  # pragma: no cover
+    _READ_KW = {}
+
 SAMPLE_COL_ALIASES = {
     "nuclide": ["nuclide", "isotope", "radionuclide", "id"],
     "value": ["value", "concentration", "activity_conc", "result"],
@@ -22,9 +39,30 @@ LIMIT_COL_ALIASES = {
     "provenance": ["provenance", "source"],
 }
 
+# Lower-cased header names each loader understands; other columns are never parsed
+_SAMPLE_KNOWN_COLS = frozenset(a for aliases in SAMPLE_COL_ALIASES.values() for a in aliases)
+_LIMIT_KNOWN_COLS = frozenset(a for aliases in LIMIT_COL_ALIASES.values() for a in aliases)
+
+_EXCEL_SUFFIXES = frozenset({".xlsx", ".xlsm", ".xls"})
+
+def _is_excel(path_or_buf, format: Optional[str]) -> bool:
+    """Pick the reader from an explicit format, else the file (or upload) name suffix."""
+    if format is not None:
+        if format not in ("excel", "csv"):
+            raise ValueError(f"Unknown format '{format}'. Choose 'excel' or 'csv'")
+        return format == "excel"
+    name = path_or_buf if isinstance(path_or_buf, (str, PathLike)) else getattr(path_or_buf, "name", None)
+    return isinstance(name, (str, PathLike)) and Path(name).suffix.lower() in _EXCEL_SUFFIXES
+
+def _read_table(path_or_buf, known_cols: frozenset, format: Optional[str] = None) -> pd.DataFrame:
+    usecols = lambda c: str(c).lower().strip() in known_cols
+    if _is_excel(path_or_buf, format):
+        return pd.read_excel(path_or_buf, engine=_EXCEL_ENGINE, usecols=usecols, **_READ_KW)
+    return pd.read_csv(path_or_buf, usecols=usecols, **_READ_KW)
+
 def _normalize_columns(df: pd.DataFrame, alias_map: dict) -> pd.DataFrame:
     colmap = {}
-    lower = {c.lower().strip(): c for c in df.columns}
+    lower = {str(c).lower().strip(): c for c in df.columns}
     for std, aliases in alias_map.items():
         for a in aliases:
             if a in lower:
@@ -37,14 +75,16 @@ def _normalize_columns(df: pd.DataFrame, alias_map: dict) -> pd.DataFrame:
             raise SchemaError(f"Missing required column: {r}")
     return out
 
-def load_samples(path_or_buf) -> pd.DataFrame:
-    df = pd.read_excel(path_or_buf) if str(path_or_buf).lower().endswith("x") else pd.read_csv(path_or_buf)
+def load_samples(path_or_buf, format: Optional[str] = None) -> pd.DataFrame:
+    """Load a samples sheet. `format` ('excel'/'csv') overrides suffix sniffing for buffers."""
+    df = _read_table(path_or_buf, _SAMPLE_KNOWN_COLS, format)
     df = _normalize_columns(df, SAMPLE_COL_ALIASES)
     keep = [c for c in SAMPLE_COL_ALIASES.keys() if c in df.columns]
     return df[keep].copy()
 
-def load_limits(path_or_buf) -> pd.DataFrame:
-    df = pd.read_excel(path_or_buf) if str(path_or_buf).lower().endswith("x") else pd.read_csv(path_or_buf)
+def load_limits(path_or_buf, format: Optional[str] = None) -> pd.DataFrame:
+    """Load a limits table. `format` ('excel'/'csv') overrides suffix sniffing for buffers."""
+    df = _read_table(path_or_buf, _LIMIT_KNOWN_COLS, format)
     df = _normalize_columns(df, LIMIT_COL_ALIASES)
     keep = [c for c in LIMIT_COL_ALIASES.keys() if c in df.columns]
     return df[keep].copy()
@@ -4,40 +4,27 @@ from pathlib import Path
 from functools import lru_cache
 from typing import Dict, Tuple
 
-def _candidate_paths() -> list[Path]:
-    paths: list[Path] = []
-    # 1) Environment variable first (explicit wins)
+# Project working dir (when running from source), then repo-relative
+# (src/sof_app/services/... -> parents[2] == project root)
+_BASE = Path(__file__).resolve().parents[2]
+_STATIC_CANDIDATES: tuple[Path, ...] = (
+    Path("data/nuclide_aliases.csv"),
+    Path("data/nuclide_aliases.json"),
+    _BASE / "data" / "nuclide_aliases.csv",
+    _BASE / "data" / "nuclide_aliases.json",
+)
+
+def _candidate_paths() -> tuple[Path, ...]:
+    # Environment variable first (explicit wins); read per call so it can change
     env = os.getenv("SOF_ALIAS_PATH")
-    if env:
-        try:
-            paths.append(Path(env))
-        except Exception:
-            pass
-    # 2) Project working dir (when running from source)
-    paths += [
-        Path("data/nuclide_aliases.csv"),
-        Path("data/nuclide_aliases.json"),
-    ]
-    # 3) Repo-relative (src/sof_app/services/... -> parents[2] == project root)
-    base = Path(__file__).resolve().parents[2]
-    paths += [
-        base / "data" / "nuclide_aliases.csv",
-        base / "data" / "nuclide_aliases.json",
-    ]
-    # de-duplicate while preserving order
-    seen = set()
-    ordered: list[Path] = []
-    for p in paths:
-        if p and str(p) not in seen:
-            ordered.append(p)
-            seen.add(str(p))
-    return ordered
+    if not env:
+        return _STATIC_CANDIDATES
+    env_path = Path(env)
+    return (env_path,) + tuple(p for p in _STATIC_CANDIDATES if p != env_path)
 
 def _load_one(path: Path) -> Dict[str, str]:
     m: Dict[str, str] = {}
     try:
-        if not path.exists():
-            return m
         suf = path.suffix.lower()
         if suf == ".csv":
             # utf-8-sig handles BOM if present
@@ -67,25 +54,62 @@ def _load_one(path: Path) -> Dict[str, str]:
                         key = a.replace(" ", "").replace("_", "").lower()
                         m[key] = c
     except Exception:
-        # swallow file-specific errors; continue with others
+        # swallow file-specific errors (incl. missing files: open() alone,
+        # no exists() pre-check); continue with others
         return {}
     return m
 
-@lru_cache(maxsize=1)
-def load_alias_map() -> Dict[str, str]:
-    merged: Dict[str, str] = {}
+def alias_sources_key() -> tuple:
+    """
+    (path, mtime_ns, size) for each existing candidate file.
+    Stats every candidate, so callers canonicalizing many names should take
+    this once and pass it to canonicalize().
+    """
+    key = []
     for p in _candidate_paths():
-        merged.update(_load_one(p))
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        key.append((str(p), st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+# Parsed alias map for the current alias_sources_key() (at most one entry)
+_alias_cache: Dict[tuple, Dict[str, str]] = {}
+
+def _alias_map_for(key: tuple) -> Dict[str, str]:
+    merged = _alias_cache.get(key)
+    if merged is None:
+        merged = {}
+        for p in _candidate_paths():
+            merged.update(_load_one(p))
+        _alias_cache.clear()
+        _alias_cache[key] = merged
     return merged
 
-def canonicalize(nuclide: str) -> Tuple[str, bool]:
-    """Return (canonical, used_alias_map) for a nuclide string."""
+def load_alias_map() -> Dict[str, str]:
+    """Merged alias map; re-read only when a source file changes (mtime/size)."""
+    return _alias_map_for(alias_sources_key())
+
+def canonicalize(nuclide: str, sources_key: tuple | None = None) -> Tuple[str, bool]:
+    """
+    Return (canonical, used_alias_map) for a nuclide string.
+    sources_key comes from alias_sources_key(); omit it to check the alias
+    files on this call.
+    """
+    if sources_key is None:
+        sources_key = alias_sources_key()
+    return _canonicalize(nuclide, sources_key)
+
+@lru_cache(maxsize=4096)
+def _canonicalize(nuclide: str, sources_key: tuple) -> Tuple[str, bool]:
+    # sources_key partitions the cache so edited alias files take effect
     from sof_app.services.matching import to_canonical as regex_canon
     raw = (nuclide or "").strip()
     if not raw:
         return "", False
     key = raw.replace(" ", "").replace("_", "").lower()
-    aliases = load_alias_map()
+    aliases = _alias_map_for(sources_key)
     if key in aliases:
         return aliases[key], True
     alt = key.replace("-", "")
@@ -1,11 +1,45 @@
 ﻿from __future__ import annotations
 import json
 import hashlib
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 from sof_app.version import __version__
 
+try:  # optional: C serializer, handles datetimes and numpy scalars natively
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+def _json_default(obj: Any) -> Any:
+    """Stdlib-json fallback for the types orjson serializes natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):  # numpy scalars / arrays
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            record,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC,
+        )
+    return json.dumps(record, indent=2, default=_json_default).encode("utf-8")
+
+@lru_cache(maxsize=64)
+def _sha256_for_key(path_str: str, mtime_ns: int, size: int) -> tuple[str, int]:
+    """Hash a file; (mtime_ns, size) only key the cache so edits invalidate it."""
+    with open(path_str, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: hashed in C, GIL released
+            h = hashlib.file_digest(f, "sha256")
+        else:
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        return h.hexdigest(), f.tell()
+
 def _sha256_file(path: str | Path) -> dict:
     """Return {path, exists, size_bytes, sha256} for a file path."""
     info = {"path": str(path) if path else None, "exists": False, "size_bytes": None, "sha256": None}
@@ -14,15 +48,11 @@ def _sha256_file(path: str | Path) -> dict:
     p = Path(path)
     if not p.is_file():
         return info
-    h = hashlib.sha256()
-    size = 0
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-            size += len(chunk)
+    st = p.stat()
+    digest, size = _sha256_for_key(str(p.resolve()), st.st_mtime_ns, st.st_size)
     info["exists"] = True
     info["size_bytes"] = size
-    info["sha256"] = h.hexdigest()
+    info["sha256"] = digest
     return info
 
 def write_audit(path: str | Path, inputs: Dict[str, Any], results: Dict[str, Any]) -> None:
@@ -33,7 +63,7 @@ def write_audit(path: str | Path, inputs: Dict[str, Any], results: Dict[str, Any
     alias_path   = (inputs or {}).get("alias_path")
 
     record = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "app_version": __version__,
 
         # compact snapshot
@@ -61,5 +91,4 @@ def write_audit(path: str | Path, inputs: Dict[str, Any], results: Dict[str, Any
 
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(record, f, indent=2)
+    p.write_bytes(_dumps(record))
@@ -1,5 +1,7 @@
 ﻿from __future__ import annotations
 import re
+from functools import lru_cache
+from typing import Optional
 
 _ELEMENT = (
     "Ac|Ag|Al|Am|Ar|As|At|Au|B|Ba|Be|Bh|Bi|Bk|Br|C|Ca|Cd|Ce|Cf|Cl|Cm|Cn|Co|Cr|Cs|Cu|Db|Ds|Dy|Er|Es|Eu|F|Fe|Fl|Fm|Fr|Ga|Gd|Ge|H|He|Hf|Hg|Ho|Hs|I|In|Ir|K|Kr|La|Li|Lr|Lu|Lv|Md|Mg|Mn|Mo|Mt|N|Na|Nb|Nd|Ne|Ni|No|Np|O|Oganesson|Os|P|Pa|Pb|Pd|Pm|Po|Pr|Pt|Pu|Ra|Rb|Re|Rf|Rg|Rh|Rn|Ru|S|Sb|Sc|Se|Sg|Si|Sm|Sn|Sr|Ta|Tb|Tc|Te|Th|Ti|Tl|Tm|Ts|U|V|W|Xe|Y|Yb|Zn|Zr"
@@ -17,18 +19,63 @@ import re
 #   "137Cs", "Cs137", "Cs-137", "99mTc", "Tc99m", "TC-99M", etc.
 _ISO_RE = r"(?:m\d*)?"  # m, m1, m2, ...
 
+_MASS_FIRST_RE = re.compile(rf"(?P<mass>\d+)(?P<iso>{_ISO_RE})(?P<sym>[A-Za-z]{{1,3}})", re.IGNORECASE)
+_SYMBOL_FIRST_RE = re.compile(rf"(?P<sym>[A-Za-z]{{1,3}})-?(?P<mass>\d+)(?P<iso>{_ISO_RE})", re.IGNORECASE)
+_CANONICAL_RE = re.compile(rf"(?P<sym>[A-Za-z]{{1,3}})-(?P<mass>\d+)(?P<iso>{_ISO_RE})?", re.IGNORECASE)
+
 def _fix_symbol(sym: str) -> str:
     sym = sym.strip()
     if not sym:
         return sym
     return sym[0].upper() + sym[1:].lower()
 
+def _is_alpha(c: str) -> bool:
+    return "A" <= c <= "Z" or "a" <= c <= "z"
+
+def _is_digit(c: str) -> bool:
+    return "0" <= c <= "9"
+
+def _canonical_fast(s: str) -> Optional[str]:
+    """
+    Regex-free scan of the common symbol-first shape 'Sym[-]MASS[m[N]]'
+    (e.g. "Cs-137", "Tc99m"). Returns None for anything else so the caller
+    falls through to the regex patterns.
+    """
+    n = len(s)
+    i = 0
+    while i < n and _is_alpha(s[i]):
+        i += 1
+    if not 1 <= i <= 3:
+        return None
+    sym_end = i
+    if i < n and s[i] == "-":
+        i += 1
+    mass_start = i
+    while i < n and _is_digit(s[i]):
+        i += 1
+    if i == mass_start:
+        return None
+    mass_end = i
+    if i < n and s[i] in "mM":
+        i += 1
+        while i < n and _is_digit(s[i]):
+            i += 1
+    if i != n:
+        return None
+    return f"{_fix_symbol(s[:sym_end])}-{s[mass_start:mass_end]}{s[mass_end:].lower()}"
+
+@lru_cache(maxsize=4096)
 def to_canonical(name: str) -> str:
     if not name:
         return name
     s = str(name).strip().replace(" ", "")
+    # 0) Fast path for symbol-first names (the common case)
+    fast = _canonical_fast(s)
+    if fast is not None:
+        return fast
+
     # 1) MASS[isomer] + Symbol  (e.g., "99mTc")
-    m = re.fullmatch(rf"(?P<mass>\d+)(?P<iso>{_ISO_RE})(?P<sym>[A-Za-z]{{1,3}})", s, flags=re.IGNORECASE)
+    m = _MASS_FIRST_RE.fullmatch(s)
     if m:
         sym = _fix_symbol(m.group("sym"))
         mass = m.group("mass")
@@ -36,7 +83,7 @@ def to_canonical(name: str) -> str:
         return f"{sym}-{mass}{iso}"
 
     # 2) Symbol + MASS[isomer] with optional hyphen (e.g., "Tc99m", "Tc-99m")
-    m = re.fullmatch(rf"(?P<sym>[A-Za-z]{{1,3}})-?(?P<mass>\d+)(?P<iso>{_ISO_RE})", s, flags=re.IGNORECASE)
+    m = _SYMBOL_FIRST_RE.fullmatch(s)
     if m:
         sym = _fix_symbol(m.group("sym"))
         mass = m.group("mass")
@@ -44,7 +91,7 @@ def to_canonical(name: str) -> str:
         return f"{sym}-{mass}{iso}"
 
     # 3) Already canonical (defensive; proper case & hyphen)
-    m = re.fullmatch(rf"(?P<sym>[A-Za-z]{{1,3}})-(?P<mass>\d+)(?P<iso>{_ISO_RE})?", s, flags=re.IGNORECASE)
+    m = _CANONICAL_RE.fullmatch(s)
     if m:
         sym = _fix_symbol(m.group("sym"))
         mass = m.group("mass")
@@ -53,4 +100,3 @@ def to_canonical(name: str) -> str:
 
     # Fallback: return as-is (lets alias file handle odd cases)
     return s
-
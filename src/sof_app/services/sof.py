@@ -6,21 +6,31 @@ from typing import Optional, Tuple, Sequence
 
 import numpy as np
 import pandas as pd
-from uncertainties import ufloat
-from uncertainties import unumpy as unp
 
-from sof_app.core.units import parse_quantity, convert_to
+try:  # optional: Arrow-backed string columns (C++ kernels for .str/merge/unique)
+    import pyarrow  # noqa: F401
+    _STRING_DTYPE = "string[pyarrow]"
+except ImportError:  # pragma: no cover
+    _STRING_DTYPE = None
+
+try:  # optional JIT for the fused SOF kernel
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+from sof_app.core.units import unit_factor
 from sof_app.core.exceptions import (
     UnitMismatchError,
     NuclideNotFoundError,
     CountsUnitDetectedError,
 )
 from sof_app.services.matching import to_canonical  # limits side
-from sof_app.services.aliases import canonicalize   # samples side
+from sof_app.services.aliases import alias_sources_key, canonicalize   # samples side
 
 VERSION = "0.1.1"
 
-# Expanded detection of counts-like strings (friendly error before units layer raises)
+# Expanded detection of counts-like strings (friendly error before units layer raises).
+# Callers lower-case the text first, so no IGNORECASE is needed.
 _COUNTS_PAT = re.compile(
     r"""
     \b(?:cpm|cps)\b
@@ -28,7 +38,7 @@ _COUNTS_PAT = re.compile(
   | \bcount(?:s)?\s*per\s*(?:min(?:ute)?|s(?:ec(?:ond)?)?)\b
   | \bcount(?:s)?\s*(?:min|s)\s*(?:-?1|\^-?1)\b
     """,
-    re.IGNORECASE | re.VERBOSE,
+    re.VERBOSE,
 )
 
 
@@ -42,11 +52,94 @@ def _require_columns(df: pd.DataFrame, cols: Sequence[str], name: str) -> None:
                          f"Expected at least: {list(cols)}")
 
 def _detect_counts_units(units: pd.Series) -> list[str]:
-    out = set()
-    for u in units.astype(str).fillna(""):
-        if _COUNTS_PAT.search(u.strip().lower()):
-            out.add(u)
-    return sorted(out)
+    # One vectorized regex pass over the distinct unit strings (units repeat heavily)
+    uniq = pd.Series(units.dropna().unique(), dtype="string")
+    mask = uniq.str.strip().str.lower().str.contains(_COUNTS_PAT, na=False)
+    return sorted(uniq[mask.to_numpy(dtype=bool)].astype(str))
+
+def _sof_kernel_py(values: np.ndarray, limits: np.ndarray, sigmas: np.ndarray):
+    """
+    Fused per-row SOF arithmetic: one pass for fraction/σ and the totals,
+    one pass for the allowed additional amount.
+    Returns (fraction, fraction_sigma, allowed_additional, sof_total, sof_sigma);
+    NaN fractions are skipped in the total, sof_sigma is NaN if no row has σ.
+    """
+    n = values.shape[0]
+    frac = np.empty(n)
+    frac_sigma = np.empty(n)
+    allowed = np.empty(n)
+    sof_total = 0.0
+    var = 0.0
+    n_sigma = 0
+    for i in range(n):
+        f = values[i] / limits[i]
+        fs = sigmas[i] / limits[i]
+        frac[i] = f
+        frac_sigma[i] = fs
+        if f == f:
+            sof_total += f
+        if fs == fs:
+            var += fs * fs
+            n_sigma += 1
+    headroom = 1.0 - sof_total
+    for i in range(n):
+        a = headroom * limits[i]
+        allowed[i] = 0.0 if a < 0.0 else a
+    sof_sigma = np.sqrt(var) if n_sigma > 0 else np.nan
+    return frac, frac_sigma, allowed, sof_total, sof_sigma
+
+# Numba is optional: JIT the kernel when available, otherwise run it as NumPy.
+if njit is not None:
+    _sof_kernel = njit(cache=True)(_sof_kernel_py)
+else:
+    def _sof_kernel(values: np.ndarray, limits: np.ndarray, sigmas: np.ndarray):
+        frac = values / limits
+        frac_sigma = sigmas / limits
+        sof_total = float(np.nansum(frac))
+        fs = frac_sigma[~np.isnan(frac_sigma)]
+        # dot() squares and sums in one BLAS call, no fs**2 temporary
+        sof_sigma = float(np.sqrt(np.dot(fs, fs))) if fs.size else np.nan
+        allowed = (1.0 - sof_total) * limits
+        allowed[allowed < 0.0] = 0.0
+        return frac, frac_sigma, allowed, sof_total, sof_sigma
+
+def _group_sums_py(codes: np.ndarray, values: np.ndarray, sigmas: np.ndarray, n: int):
+    """
+    Fused per-group reduction for duplicate combining: Σvalue, Σσ² and the
+    count of rows carrying σ, in one pass. NaN values/σ are skipped.
+    """
+    value_sum = np.zeros(n)
+    sigma_sq = np.zeros(n)
+    sigma_n = np.zeros(n, dtype=np.int64)
+    for i in range(codes.shape[0]):
+        g = codes[i]
+        v = values[i]
+        if v == v:
+            value_sum[g] += v
+        s = sigmas[i]
+        if s == s:
+            sigma_sq[g] += s * s
+            sigma_n[g] += 1
+    return value_sum, sigma_sq, sigma_n
+
+if njit is not None:
+    _group_sums = njit(cache=True)(_group_sums_py)
+else:
+    def _group_sums(codes: np.ndarray, values: np.ndarray, sigmas: np.ndarray, n: int):
+        has_sigma = ~np.isnan(sigmas)
+        value_sum = np.bincount(codes, weights=np.nan_to_num(values, nan=0.0), minlength=n)
+        sigma_sq = np.bincount(codes, weights=np.where(has_sigma, sigmas * sigmas, 0.0), minlength=n)
+        sigma_n = np.bincount(codes, weights=has_sigma, minlength=n)
+        return value_sum, sigma_sq, sigma_n
+
+def _normalize_unit_column(units: pd.Series) -> pd.Series:
+    """Column-wide equivalent of units._normalize_unit_text (NaN -> '')."""
+    return (
+        units.fillna("").astype(str).str.strip()
+        .str.replace(" ", "", regex=False)
+        .str.replace("µ", "u", regex=False)
+        .str.replace("^", "**", regex=False)
+    )
 
 def _align_and_convert(
     samples: pd.DataFrame,
@@ -58,8 +151,13 @@ def _align_and_convert(
     _require_columns(samples, _REQUIRED_S_COLS, "samples")
     _require_columns(limits, _REQUIRED_L_COLS, "limits")
 
-    s = samples.copy()
-    l = limits.copy()
+    # No defensive copies: new columns are added via assign(), which leaves
+    # the caller's frames untouched and only allocates the added columns.
+    s = samples
+    l = limits
+    if _STRING_DTYPE:
+        s = s.astype({"nuclide": _STRING_DTYPE, "unit": _STRING_DTYPE})
+        l = l.astype({"nuclide": _STRING_DTYPE, "limit_unit": _STRING_DTYPE})
 
     # 1) Safety: block counts-only units with a clear message
     counts_found = _detect_counts_units(s["unit"])
@@ -73,14 +171,26 @@ def _align_and_convert(
         raise CountsUnitDetectedError(msg)
 
     # 2) Canonicalize names
-    s["_canon_used_alias"] = False
-    s["nuclide_canon"], s["_canon_used_alias"] = zip(*s["nuclide"].map(canonicalize))
-    l["nuclide_canon"] = l["nuclide"].map(to_canonical)
+    # (one canonicalize call per distinct name; sheets repeat nuclides heavily;
+    # alias files are stat'ed once per compute, not once per name)
+    alias_key = alias_sources_key()
+    canon_name: dict = {}
+    canon_alias: dict = {}
+    for n in s["nuclide"].dropna().unique():
+        canon_name[n], canon_alias[n] = canonicalize(n, alias_key)
+    s = s.assign(
+        nuclide_canon=s["nuclide"].map(canon_name).astype(s["nuclide"].dtype),
+        _canon_used_alias=s["nuclide"].map(canon_alias).fillna(False).astype(bool),
+    )
+    lim_canon = {n: to_canonical(n) for n in l["nuclide"].dropna().unique()}
+    l = l.assign(nuclide_canon=l["nuclide"].map(lim_canon).astype(l["nuclide"].dtype))
 
     # Optional category filter (robust normalization)
     if category and "category" in l.columns:
         key = category.strip().casefold()
-        l = l[l["category"].astype(str).str.strip().str.casefold() == key].copy()
+        # Normalize the few distinct labels, then one vectorized isin() over the column
+        wanted = [c for c in l["category"].unique() if str(c).strip().casefold() == key]
+        l = l[l["category"].isin(wanted)]
         if l.empty:
             raise ValueError(f"No limits found for category '{category}'")
 
@@ -97,52 +207,72 @@ def _align_and_convert(
     dup_l = l["nuclide_canon"].value_counts(dropna=False)
     dup_l = dup_l[dup_l > 1]
     if not dup_l.empty:
+        keys = [str(k).strip() or "<blank>" for k in dup_l.index.astype(object).fillna("")]
         raise ValueError(f"Limits table has multiple rows for canonical nuclide(s): "
-                         f"{', '.join(dup_l.index.astype(str))}")
+                         f"{', '.join(keys)}")
 
-    # Merge samples → limits (many-to-one)
-    merged = pd.merge(
-        s, l, how="left", on="nuclide_canon", suffixes=("_samp", "_lim"), validate="m:1"
+    # Join samples → limits (many-to-one). Keys are unique after the check
+    # above, so probe the limits index directly instead of a full merge.
+    merged = s.join(
+        l.set_index("nuclide_canon"), on="nuclide_canon", lsuffix="_samp", rsuffix="_lim"
     )
 
     # Detect missing limit matches
-    missing_mask = merged["limit_value"].isna()
+    missing_mask = merged["limit_value"].isna().to_numpy()
     missing_samples: list[str] = []
     if missing_mask.any():
-        missing_samples = merged.loc[missing_mask, "nuclide"].astype(str).unique().tolist()
+        missing_samples = merged.loc[missing_mask, "nuclide_samp"].astype(str).unique().tolist()
         if not treat_missing_as_zero:
             raise NuclideNotFoundError(f"Limits not found for: {missing_samples}")
         merged = merged[~missing_mask].copy()
 
-    if merged.empty:
-        # Nothing to compute
-        return merged, unmapped_aliases, missing_samples
-
-    # Unit convert samples to the limit units
-    def convert_row(row):
-        q_s = parse_quantity(row["value"], row["unit"])
-        q_l = parse_quantity(row["limit_value"], row["limit_unit"])
-
-        # Validate limit > 0 (safety)
-        if float(q_l.magnitude) <= 0:
-            raise ValueError(
-                f"Non-positive limit for {row['nuclide_canon']}: "
-                f"{row['limit_value']} {row['limit_unit']}"
-            )
-        try:
-            q_s_conv = convert_to(q_s, str(q_l.units))
-        except Exception as exc:
-            raise UnitMismatchError(
-                f"Cannot convert sample unit '{row['unit']}' to limit unit "
-                f"'{row['limit_unit']}' for {row['nuclide_canon']}"
-            ) from exc
-        return float(q_s_conv.magnitude), float(q_l.magnitude), str(q_l.units)
-
-    converted = merged.apply(
-        lambda r: pd.Series(convert_row(r), index=["value_conv", "limit_value_base", "unit_base"]),
-        axis=1,
+    # Unit convert samples to the limit units. Unit text is normalized
+    # column-wide and category-encoded, so each distinct unit is resolved once
+    # and rows index small factor/dimension tables by code.
+    n = len(merged)
+    units = pd.Categorical(pd.concat(
+        [_normalize_unit_column(merged["unit"]), _normalize_unit_column(merged["limit_unit"])],
+        ignore_index=True,
+    ))
+    blank = np.flatnonzero(np.asarray(units == "")) % n
+    if blank.size:
+        row = merged.iloc[blank[0]]
+        raise ValueError(f"Blank unit for {row['nuclide_canon']}")
+    dim_ids: dict = {}
+    cat_dim = np.empty(len(units.categories), dtype=np.int64)
+    cat_fac = np.empty(len(units.categories), dtype=float)
+    for i, u in enumerate(units.categories):
+        dim, cat_fac[i] = unit_factor(u)
+        cat_dim[i] = dim_ids.setdefault(dim, len(dim_ids))
+    samp_codes = units.codes[:n]
+    lim_codes = units.codes[n:]
+
+    limit_values = merged["limit_value"].to_numpy(dtype=float)
+
+    # Validate limit > 0 (safety)
+    bad = np.flatnonzero(limit_values <= 0)
+    if bad.size:
+        row = merged.iloc[bad[0]]
+        raise ValueError(
+            f"Non-positive limit for {row['nuclide_canon']}: "
+            f"{row['limit_value']} {row['limit_unit']}"
+        )
+
+    bad = np.flatnonzero(cat_dim[samp_codes] != cat_dim[lim_codes])
+    if bad.size:
+        row = merged.iloc[bad[0]]
+        raise UnitMismatchError(
+            f"Cannot convert sample unit '{row['unit']}' to limit unit "
+            f"'{row['limit_unit']}' for {row['nuclide_canon']}"
+        )
+
+    merged["value_conv"] = (
+        merged["value"].to_numpy(dtype=float)
+        * cat_fac[samp_codes]
+        / cat_fac[lim_codes]
     )
-    merged = pd.concat([merged, converted], axis=1)
+    merged["limit_value_base"] = limit_values
+    merged["unit_base"] = merged["limit_unit"].astype(str).str.strip()
     return merged, unmapped_aliases, missing_samples
 
 def _combine_duplicates(merged: pd.DataFrame) -> pd.DataFrame:
@@ -152,18 +282,35 @@ def _combine_duplicates(merged: pd.DataFrame) -> pd.DataFrame:
     if "sigma" not in merged.columns:
         merged["sigma"] = np.nan
 
-    agg = {
-        "value_conv": "sum",
-        "limit_value_base": "first",
-        "unit_base": "first",
-        "sigma": (lambda x: np.sqrt(np.nansum(np.square(x.values)))
-                  if np.any(~pd.isna(x.values)) else np.nan),
+    # Integer group ids (sorted by key, like groupby); NaN keys get -1 and are dropped
+    codes, uniques = pd.factorize(merged["nuclide_canon"].to_numpy(), sort=True)
+    keep = codes >= 0
+    codes = codes[keep]
+    n = len(uniques)
+
+    values = np.ascontiguousarray(merged["value_conv"].to_numpy(dtype=float)[keep])
+    sigmas = np.ascontiguousarray(merged["sigma"].to_numpy(dtype=float)[keep])
+    value_sum, sigma_sq, sigma_n = _group_sums(codes, values, sigmas, n)
+
+    def first(col: str) -> np.ndarray:
+        """First non-null value of a column per group."""
+        vals = merged[col][keep]
+        pos = np.flatnonzero(vals.notna().to_numpy())
+        groups, idx = np.unique(codes[pos], return_index=True)
+        return pd.Series(vals.iloc[pos[idx]].to_numpy(), index=groups).reindex(range(n)).to_numpy()
+
+    out = {
+        "nuclide_canon": uniques,
+        "value_conv": value_sum,
+        "limit_value_base": first("limit_value_base"),
+        "unit_base": first("unit_base"),
+        "sigma": np.where(sigma_n > 0, np.sqrt(sigma_sq), np.nan),
     }
     for col in ("rule_name", "category", "note"):
         if col in merged.columns:
-            agg[col] = "first"
+            out[col] = first(col)
 
-    return merged.groupby("nuclide_canon", as_index=False).agg(agg)
+    return pd.DataFrame(out)
 
 def compute_sof(
     samples: pd.DataFrame,
@@ -189,50 +336,42 @@ def compute_sof(
     if combine_duplicates:
         m = _combine_duplicates(m)
 
-    # Fractions, with uncertainty if sigma present
-    if "sigma" in m.columns and not m["sigma"].isna().all():
-        fracs, sigmas = [], []
-        for _, r in m.iterrows():
-            if pd.notna(r.get("sigma", np.nan)):
-                q = ufloat(r["value_conv"], r["sigma"]) / r["limit_value_base"]
-                fracs.append(unp.nominal_values(q))
-                sigmas.append(unp.std_devs(q))
-            else:
-                fracs.append(r["value_conv"] / r["limit_value_base"])
-                sigmas.append(np.nan)
-        m["fraction"], m["fraction_sigma"] = fracs, sigmas
-    else:
-        m["fraction"] = m["value_conv"] / m["limit_value_base"]
-        m["fraction_sigma"] = np.nan
-
-    sof_total = float(m["fraction"].sum()) if not m.empty else 0.0
-    sof_sigma = None
-    if m["fraction_sigma"].notna().any():
-        var = np.nansum(np.square(m["fraction_sigma"].values))
-        sof_sigma = float(np.sqrt(var))
-
-    # Per-row “allowed additional” (truncate below 0)
-    m["allowed_additional_in_limit_units"] = m.apply(
-        lambda r: max(0.0, (1.0 - sof_total) * r["limit_value_base"]), axis=1
-    )
+    # Fractions, with uncertainty if sigma present (uncorrelated: σ_frac = σ / limit)
+    v = np.ascontiguousarray(m["value_conv"].to_numpy(dtype=float))
+    L = np.ascontiguousarray(m["limit_value_base"].to_numpy(dtype=float))
+    sig = (np.ascontiguousarray(m["sigma"].to_numpy(dtype=float))
+           if "sigma" in m.columns else np.full(len(m), np.nan))
+    frac, frac_sigma, allowed, sof_total, sof_sigma = _sof_kernel(v, L, sig)
+    sof_total = float(sof_total)
+    sof_sigma = None if np.isnan(sof_sigma) else float(sof_sigma)
 
     # Display formatting
     sf = max(1, int(display_sigfigs))
-    fmt = f"{{:.{sf}g}}"
-    m["conc_display"] = m.apply(lambda r: f"{fmt.format(r['value_conv'])} {r['unit_base']}", axis=1)
-    m["limit_display"] = m.apply(lambda r: f"{fmt.format(r['limit_value_base'])} {r['unit_base']}", axis=1)
-    m["fraction_display"] = m["fraction"].map(lambda x: fmt.format(x))
-
-    out_cols = [
-        "nuclide_canon", "conc_display", "limit_display",
-        "fraction", "fraction_display", "fraction_sigma",
-        "allowed_additional_in_limit_units",
-    ]
-    out = m[out_cols].rename(columns={"nuclide_canon": "nuclide"})
+    spec = f".{sf}g"
+    units = m["unit_base"].to_numpy()
+
+    # Build the result in one constructor call; copy=False adopts the kernel arrays
+    out = pd.DataFrame({
+        "nuclide": m["nuclide_canon"].to_numpy(),
+        "conc_display": [f"{format(x, spec)} {u}" for x, u in zip(v, units)],
+        "limit_display": [f"{format(x, spec)} {u}" for x, u in zip(L, units)],
+        "fraction": frac,
+        "fraction_display": [format(x, spec) for x in frac],
+        "fraction_sigma": frac_sigma,
+        # Per-row “allowed additional” (truncated below 0 by the kernel)
+        "allowed_additional_in_limit_units": allowed,
+    }, copy=False)
+
+    def first_valid(col: str, default):
+        # Positional lookup: m may carry the caller's (possibly non-unique) index
+        if col not in m.columns:
+            return default
+        pos = np.flatnonzero(m[col].notna().to_numpy())
+        return m[col].iat[pos[0]] if pos.size else default
 
     summary = {
-        "rule_name": (m["rule_name"].dropna().iloc[0] if "rule_name" in m.columns and not m["rule_name"].dropna().empty else "(unspecified)"),
-        "category": (category if category else (m["category"].dropna().iloc[0] if "category" in m.columns and not m["category"].dropna().empty else None)),
+        "rule_name": first_valid("rule_name", "(unspecified)"),
+        "category": category if category else first_valid("category", None),
         "sof_total": sof_total,
         "sof_sigma": sof_sigma,
         "pass_limit": sof_total <= 1.0,
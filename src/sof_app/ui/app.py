@@ -1,10 +1,24 @@
 ﻿from __future__ import annotations
+import io
 import streamlit as st
 from sof_app.io.excel_loader import load_samples, load_limits
 from sof_app.services.sof import compute_sof
 from sof_app.io.exporters import export_csv
 from sof_app.services.audit import write_audit
 
+@st.cache_data(show_spinner=False)
+def _cached_load_samples(data: bytes, name: str):
+    # Keyed on the upload bytes + name: re-runs skip the Excel parse entirely
+    buf = io.BytesIO(data)
+    buf.name = name
+    return load_samples(buf)
+
+@st.cache_data(show_spinner=False)
+def _cached_load_limits(data: bytes, name: str):
+    buf = io.BytesIO(data)
+    buf.name = name
+    return load_limits(buf)
+
 st.set_page_config(page_title="SOF Calculator", layout="wide")
 st.title("Sum of Fractions (SOF) Calculator")
 
@@ -26,8 +40,8 @@ if run_btn:
         st.error("Please upload both samples and limits files.")
         st.stop()
     try:
-        samples = load_samples(samples_file)
-        limits = load_limits(limits_file)
+        samples = _cached_load_samples(samples_file.getvalue(), samples_file.name)
+        limits = _cached_load_limits(limits_file.getvalue(), limits_file.name)
         per_nuclide, summary = compute_sof(samples, limits, category or None)
     except Exception as e:
         st.exception(e)
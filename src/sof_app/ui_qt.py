@@ -1,7 +1,12 @@
 ﻿from __future__ import annotations
 from pathlib import Path
+from functools import lru_cache
 import sys, os, json, traceback, math
-import pandas as pd
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:  # pandas itself is imported lazily, on first load/compute
+    import pandas as pd
 
 def _resource_path(*parts) -> Path:
     """
@@ -16,6 +21,19 @@ def _resource_path(*parts) -> Path:
 
 from sof_app.version import __version__
 
+try:  # optional: C JSON codec for the settings file (stdlib json otherwise)
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+def _settings_dumps(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def _settings_loads(raw: bytes) -> dict:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 # Prefer PySide6 (LGPL). Allow explicit opt-in to PyQt6 via env.
 BINDING = os.getenv("SOF_QT_BINDING", "pyside6").lower()
 USING_PYQT = False
@@ -24,39 +42,49 @@ if BINDING == "pyqt6":
     try:
         from PyQt6.QtWidgets import (
             QApplication, QWidget, QLabel, QPushButton, QLineEdit, QFileDialog,
-            QGridLayout, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView,
+            QGridLayout, QMessageBox, QTableView, QHeaderView,
             QCheckBox, QSpinBox, QComboBox, QDoubleSpinBox
         )
-        from PyQt6.QtCore import Qt, QUrl
+        from PyQt6.QtCore import (
+            Qt, QUrl, QTimer, QObject, QRunnable, QThreadPool, QAbstractTableModel, QModelIndex
+        )
+        from PyQt6.QtCore import pyqtSignal as Signal
         from PyQt6.QtGui import QGuiApplication, QDesktopServices, QIcon
         USING_PYQT = True
     except ModuleNotFoundError:
         # fall back to PySide6 if PyQt6 not available
         from PySide6.QtWidgets import (
             QApplication, QWidget, QLabel, QPushButton, QLineEdit, QFileDialog,
-            QGridLayout, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView,
+            QGridLayout, QMessageBox, QTableView, QHeaderView,
             QCheckBox, QSpinBox, QComboBox, QDoubleSpinBox
         )
-        from PySide6.QtCore import Qt, QUrl
+        from PySide6.QtCore import (
+            Qt, QUrl, QTimer, QObject, QRunnable, QThreadPool, QAbstractTableModel, QModelIndex, Signal
+        )
         from PySide6.QtGui import QGuiApplication, QDesktopServices, QIcon
 else:
     try:
         # default path: PySide6
         from PySide6.QtWidgets import (
             QApplication, QWidget, QLabel, QPushButton, QLineEdit, QFileDialog,
-            QGridLayout, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView,
+            QGridLayout, QMessageBox, QTableView, QHeaderView,
             QCheckBox, QSpinBox, QComboBox, QDoubleSpinBox
         )
-        from PySide6.QtCore import Qt, QUrl
+        from PySide6.QtCore import (
+            Qt, QUrl, QTimer, QObject, QRunnable, QThreadPool, QAbstractTableModel, QModelIndex, Signal
+        )
         from PySide6.QtGui import QGuiApplication, QDesktopServices, QIcon
     except ModuleNotFoundError:
         # as last resort, try PyQt6 (GPL)
         from PyQt6.QtWidgets import (
             QApplication, QWidget, QLabel, QPushButton, QLineEdit, QFileDialog,
-            QGridLayout, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView,
+            QGridLayout, QMessageBox, QTableView, QHeaderView,
             QCheckBox, QSpinBox, QComboBox, QDoubleSpinBox
         )
-        from PyQt6.QtCore import Qt, QUrl
+        from PyQt6.QtCore import (
+            Qt, QUrl, QTimer, QObject, QRunnable, QThreadPool, QAbstractTableModel, QModelIndex
+        )
+        from PyQt6.QtCore import pyqtSignal as Signal
         from PyQt6.QtGui import QGuiApplication, QDesktopServices, QIcon
         USING_PYQT = True
         print(
@@ -66,42 +94,143 @@ else:
         )
 
 
-# ---- Numeric sorting helper  ----
-class NumericItem(QTableWidgetItem):
+# ---- Per-nuclide table model ----
+_ALIGN_NUM = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+class PerNuclideModel(QAbstractTableModel):
     """
-    QTableWidgetItem that sorts by a numeric key (Qt.UserRole).
-    NaNs are pushed to the end when sorting ascending.
+    Read-only model over the per-nuclide result. Display text and numeric sort
+    keys are prepared per column in set_frame(); data() only indexes them, so
+    the view formats just the visible cells. NaNs sort last when ascending.
     """
-    def __init__(self, value: float, text: str | None = None, nan_high: bool = True):
-        if text is None:
-            if value is None or (isinstance(value, float) and math.isnan(value)):
-                text = ""
+    COLUMNS = ["nuclide","conc_display","limit_display","fraction","fraction_sigma","allowed_additional_in_limit_units"]
+    HEADERS = ["Nuclide","Conc","Limit","Fraction","σ(fraction)","Allowed addl (limit units)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._texts: list = [np.empty(0, dtype=object)] * len(self.COLUMNS)
+        self._keys: list = [None] * len(self.COLUMNS)  # float keys; None = text column
+        self._order = np.empty(0, dtype=np.intp)       # view row -> frame row
+        self._sort: tuple | None = None                # last (column, order) requested by the view
+
+    def set_frame(self, df) -> None:
+        import pandas as pd
+
+        n = len(df)
+        texts, keys = [], []
+        for col in self.COLUMNS:
+            if col not in df.columns:
+                texts.append(np.full(n, "", dtype=object)); keys.append(None)
+                continue
+            if col == "nuclide":
+                # plain text
+                texts.append(df[col].astype("string").fillna("").to_numpy(dtype=object)); keys.append(None)
+                continue
+            if col in ("conc_display", "limit_display"):
+                # parse number for sorting; prefer raw numeric columns if present
+                txt = df[col].astype("string").fillna("").to_numpy(dtype=object)
+                raw = {"conc_display": "value_conv", "limit_display": "limit_value_base"}[col]
+                if raw in df.columns:
+                    vals = pd.to_numeric(df[raw], errors="coerce").to_numpy(dtype=np.float64)
+                else:
+                    vals = _num_from_display_series(df[col])
             else:
-                text = str(value)
-        super().__init__(text)
-        # numeric sort key
-        try:
-            v = float(value)
-        except Exception:
-            v = float("nan")
-        if math.isnan(v):
-            v_sort = float("inf") if nan_high else float("-inf")
-        else:
-            v_sort = v
-        self.setData(Qt.ItemDataRole.UserRole, v_sort)
-        self.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                # numeric with pretty text
+                vals = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+                if col == "fraction" and "fraction_display" in df.columns:
+                    txt = df["fraction_display"].astype(str).to_numpy(dtype=object)
+                else:
+                    txt = np.where(np.isnan(vals), "", np.char.mod("%.4g", np.nan_to_num(vals, nan=0.0, posinf=np.inf, neginf=-np.inf))).astype(object)
+            texts.append(txt)
+            keys.append(np.where(np.isnan(vals), np.inf, vals))
+
+        self.beginResetModel()
+        self._texts, self._keys = texts, keys
+        self._order = self._sorted_order(*self._sort) if self._sort else np.arange(n)
+        self.endResetModel()
+
+    def _sorted_order(self, column: int, order) -> np.ndarray:
+        key = self._keys[column]
+        if key is None:
+            key = self._texts[column].astype(str)
+        idx = np.argsort(key, kind="stable")
+        return idx[::-1] if order == Qt.SortOrder.DescendingOrder else idx
+
+    # --- QAbstractTableModel interface ---
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        c = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self._texts[c][self._order[index.row()]])
+        if role == Qt.ItemDataRole.TextAlignmentRole and self._keys[c] is not None:
+            return _ALIGN_NUM
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        return _FLAGS
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder) -> None:
+        # column -1 (Qt 6 "unsorted") restores frame order
+        self._sort = (column, order) if 0 <= column < len(self.COLUMNS) else None
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        src_rows = [int(self._order[i.row()]) for i in old]
+        self._order = self._sorted_order(*self._sort) if self._sort else np.arange(len(self._order))
+        pos = np.empty_like(self._order)
+        pos[self._order] = np.arange(len(self._order))
+        self.changePersistentIndexList(old, [self.index(int(pos[r]), i.column()) for r, i in zip(src_rows, old)])
+        self.layoutChanged.emit()
+
+# pandas, the loaders and compute_sof (which pulls in numba) are imported on
+# first use, so the window can show before the data stack has loaded.
+
+# Parsed inputs keyed on (path, mtime, size): validate/compute/category refresh
+# and auto-recompute reuse one parse until the file changes on disk.
+@lru_cache(maxsize=8)
+def _load_samples_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    from sof_app.io.excel_loader import load_samples
+    return load_samples(path)
+
+@lru_cache(maxsize=8)
+def _load_limits_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    from sof_app.io.excel_loader import load_limits
+    return load_limits(path)
+
+def _file_key(path: str) -> tuple[str, int, int]:
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+class _ComputeSignals(QObject):
+    finished = Signal(int, object)  # (generation, (per_nuclide, summary, category))
+    failed = Signal(int, str)       # (generation, message)
+
+class _ComputeWorker(QRunnable):
+    """Runs load + compute_sof on the thread pool; results come back via queued signals."""
+    def __init__(self, generation: int, job):
+        super().__init__()
+        self.generation = generation
+        self.job = job
+        self.signals = _ComputeSignals()
 
-    def __lt__(self, other: QTableWidgetItem) -> bool:
+    def run(self):
         try:
-            a = float(self.data(Qt.ItemDataRole.UserRole))
-            b = float(other.data(Qt.ItemDataRole.UserRole))
-            return a < b
-        except Exception:
-            return super().__lt__(other)
-
-from sof_app.io.excel_loader import load_samples, load_limits
-from sof_app.services.sof import compute_sof
-from sof_app.services.audit import write_audit
+            result = self.job()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(self.generation, f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(self.generation, result)
 
 def _num_from_display(val) -> float:
     """Extract leading numeric token from '123.4 unit' for sorting."""
@@ -116,6 +245,12 @@ def _num_from_display(val) -> float:
     except Exception:
         return float("nan")
 
+def _num_from_display_series(s: pd.Series) -> np.ndarray:
+    """Column-wide _num_from_display: leading numeric token of each cell, NaN if none."""
+    import pandas as pd
+    head = s.astype("string").str.strip().str.split(n=1).str[0].str.replace(",", "", regex=False)
+    return pd.to_numeric(head, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
 SETTINGS_PATH = os.path.join(os.path.expanduser("~"), ".sof_app_settings.json")
 
 class DropLineEdit(QLineEdit):
@@ -151,8 +286,8 @@ class SofQt(QWidget):
                 return
 
             # Load (re-using your loaders so Excel/CSV both work)
-            samples = load_samples(self.samples_path)
-            limits  = load_limits(self.limits_path)
+            samples = self._get_samples()
+            limits  = self._get_limits()
 
             problems = []
 
@@ -180,19 +315,20 @@ class SofQt(QWidget):
                     problems.append(f"- Limits has duplicate nuclides (raw names): {', '.join(dup.index[:10])}"
                                     + (" …" if len(dup) > 10 else ""))
 
-            # Counts units sanity check (cpm/cps/count)
             if "unit" in samples.columns:
-                ustr = samples["unit"].astype(str).str.lower()
-                mask = ustr.str.contains(r"\bcpm\b|\bcps\b|count", regex=True)
+                # One string conversion of the unit column shared by both checks
+                u = samples["unit"].astype("string")
+
+                # Counts units sanity check (cpm/cps/count)
+                mask = u.str.lower().str.contains(r"\bcp[ms]\b|count", regex=True, na=False)
                 if mask.any():
-                    ex = samples.loc[mask, "unit"].astype(str).unique()
+                    ex = u[mask].unique().tolist()
                     problems.append(f"- Counts units detected in samples: {', '.join(ex[:6])}"
                                     + (" …" if len(ex) > 6 else "")
                                     + " (convert to activity first, e.g., dpm or Bq).")
 
-            # Surface /100 cm^2 hint
-            if "unit" in samples.columns:
-                if samples["unit"].astype(str).str.contains(r"/\s*100\s*cm\^?2|\*\*2", regex=True).any():
+                # Surface /100 cm^2 hint
+                if u.str.contains(r"/\s*100\s*cm\^?2|\*\*2", regex=True, na=False).any():
                     problems.append("- Note: surface units like dpm/100 cm^2 will be auto-normalized to Bq/m^2.")
 
             if problems:
@@ -211,6 +347,16 @@ class SofQt(QWidget):
         self.limits_path  = ""
         self.per_nuclide_df = None
         self.summary = None
+        self._last_settings_bytes: bytes | None = None  # last payload written to SETTINGS_PATH
+        self._categories_cache: dict | None = None   # {"key": [path, mtime_ns, size], "categories": [...]}
+        self._compute_generation = 0  # bumps per compute(); stale worker results are dropped
+        self._compute_worker = None
+
+        # Debounce auto-recompute: a burst of option changes runs compute once
+        self._recalc_timer = QTimer(self)
+        self._recalc_timer.setSingleShot(True)
+        self._recalc_timer.setInterval(150)
+        self._recalc_timer.timeout.connect(lambda: self.compute(auto=True))
 
         grid = QGridLayout(self)
 
@@ -257,10 +403,9 @@ class SofQt(QWidget):
         self.spin_warn.setDecimals(2)
         self.spin_warn.setSingleStep(0.01)
         self.spin_warn.setValue(0.90)  # default
-        self.spin_warn.valueChanged.connect(self._maybe_autorecompute)
-        
-        #Optional banner recolor w/o calc.
-        self.spin_warn.valueChanged.connect(lambda _=None: (self.populate_ui() if self.summary is not None else None))
+        # The threshold only colors the banner: recolor (and persist) without
+        # recomputing or repopulating the table.
+        self.spin_warn.valueChanged.connect(self._on_warn_changed)
         grid.addWidget(self.spin_warn, row, 1); row += 1
 
         # Buttons
@@ -320,24 +465,30 @@ class SofQt(QWidget):
 
 
         # Table
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "Nuclide","Conc","Limit","Fraction","σ(fraction)","Allowed addl (limit units)"
-        ])
+        self.table_model = PerNuclideModel(self)
+        self.table = QTableView(self)
+        self.table.setModel(self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
         self.table.setSortingEnabled(True)
         grid.addWidget(self.table, row, 0, 1, 3)
 
         # Load sticky settings (last paths/options)
         self.load_settings()
 
+    # ----- cached inputs (shallow copies so callers never share column objects) -----
+    def _get_samples(self, path: str | None = None) -> pd.DataFrame:
+        return _load_samples_cached(*_file_key(path or self.samples_path)).copy(deep=False)
+
+    def _get_limits(self, path: str | None = None) -> pd.DataFrame:
+        return _load_limits_cached(*_file_key(path or self.limits_path)).copy(deep=False)
+
     # ----- settings -----
     def load_settings(self):
         try:
             if os.path.exists(SETTINGS_PATH):
-                with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                    s = json.load(f)
+                with open(SETTINGS_PATH, "rb") as f:
+                    s = _settings_loads(f.read())
                 self.samples_path = s.get("samples_path",""); self.samples_edit.setText(self.samples_path or "")
                 self.limits_path  = s.get("limits_path","");  self.limits_edit.setText(self.limits_path or "")
                 self.chk_combine.setChecked(bool(s.get("combine_duplicates", True)))
@@ -355,8 +506,12 @@ class SofQt(QWidget):
                     self.spin_warn.setValue(wtv)
 
                 # If limits exists, populate categories and restore selection
+                # (from the saved list when the file is unchanged: no parse at startup)
                 if self.limits_path and os.path.isfile(self.limits_path):
-                    self._populate_categories_from_limits(self.limits_path, select=s.get("category"))
+                    cached = s.get("limits_categories") or {}
+                    cats = cached.get("categories") if cached.get("key") == list(_file_key(self.limits_path)) else None
+                    self._populate_categories_from_limits(self.limits_path, select=s.get("category"),
+                                                          cats=cats, quiet=True)
         except Exception:
             # non-fatal; continue with defaults
             pass
@@ -370,11 +525,18 @@ class SofQt(QWidget):
             "display_sigfigs": int(self.spin_sig.value()),
             "category": category if category is not None else (None if self.cat_combo.currentIndex()<=0 else self.cat_combo.currentText().strip()),
             "warn_threshold": float(self.spin_warn.value()),
-
+            "limits_categories": self._categories_cache,
         }
+        payload = _settings_dumps(data)
+        if payload == self._last_settings_bytes:
+            return  # nothing changed; skip the disk write
         try:
-            with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            # write-then-rename so a crash never leaves a truncated settings file
+            tmp = SETTINGS_PATH + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, SETTINGS_PATH)
+            self._last_settings_bytes = payload
         except Exception:
             pass
 
@@ -403,23 +565,37 @@ class SofQt(QWidget):
         self._populate_categories_from_limits(path)
         self.save_settings()
 
-    def _populate_categories_from_limits(self, path: str, select: str | None = None):
+    def _populate_categories_from_limits(self, path: str, select: str | None = None,
+                                         cats: list[str] | None = None, quiet: bool = False):
         try:
-            lim = load_limits(path)
-            self.cat_combo.clear()
-            self.cat_combo.addItem("(none)")
-            cats = []
-            if "category" in lim.columns:
-                cats = sorted([c for c in lim["category"].dropna().unique().tolist() if str(c).strip() != ""])
-                for c in cats: self.cat_combo.addItem(str(c))
-            # try to select
-            if select and select in cats:
-                idx = self.cat_combo.findText(select)
-                if idx >= 0:
-                    self.cat_combo.setCurrentIndex(idx+1)  # +1 for (none)
+            key = _file_key(path)
+            if cats is None:
+                lim = _load_limits_cached(*key)
+                cats = []
+                if "category" in lim.columns:
+                    ser = lim["category"].dropna().astype("string").str.strip()
+                    cats = np.sort(ser[ser != ""].unique().to_numpy(dtype=object)).tolist()
+            # persisted with the settings so the next start can skip the parse
+            self._categories_cache = {"key": list(key), "categories": list(cats)}
         except Exception as e:
             QMessageBox.warning(self, "Limits read", f"Could not read categories: {e}")
-            
+            return
+
+        # Refill silently (clear/add would each fire currentIndexChanged → recompute),
+        # then recompute once: a new limits file changes the results even when the
+        # selected category text stays the same. Settings restore passes quiet=True.
+        self.cat_combo.blockSignals(True)
+        try:
+            self.cat_combo.clear()
+            self.cat_combo.addItems(["(none)"] + cats)
+            # try to select (findText counts the "(none)" entry at index 0)
+            idx = self.cat_combo.findText(select) if select and select in cats else 0
+            self.cat_combo.setCurrentIndex(max(idx, 0))
+        finally:
+            self.cat_combo.blockSignals(False)
+        if not quiet:
+            self._maybe_autorecompute()
+
 
     def show_csv_tips(self):
             # Works with PyQt6 or PySide6
@@ -503,23 +679,44 @@ class SofQt(QWidget):
     # ----- compute & UI update -----
     def _maybe_autorecompute(self, *args):
         if self.samples_path and self.limits_path and self.per_nuclide_df is not None:
-            self.compute(auto=True)
+            self._recalc_timer.start()  # (re)starts the window; fires once when changes settle
 
     def compute(self, auto: bool=False):
+        if not self.samples_path or not self.limits_path:
+            if not auto:
+                QMessageBox.warning(self, "Missing input", "Please select both Samples and Limits files.")
+            return
+
+        # Read every widget here on the GUI thread; the worker only sees plain values
+        samples_path, limits_path = self.samples_path, self.limits_path
+        cat = None if self.cat_combo.currentIndex() <= 0 else self.cat_combo.currentText().strip()
+        opts = dict(
+            combine_duplicates=self.chk_combine.isChecked(),
+            treat_missing_as_zero=self.chk_missing_zero.isChecked(),
+            display_sigfigs=int(self.spin_sig.value()),
+        )
+
+        def job():
+            from sof_app.services.sof import compute_sof
+            samples = self._get_samples(samples_path)
+            limits  = self._get_limits(limits_path)
+            per, summ = compute_sof(samples, limits, cat, **opts)
+            return per, summ, cat
+
+        self._compute_generation += 1
+        worker = _ComputeWorker(self._compute_generation, job)
+        worker.signals.finished.connect(self._on_compute_done)
+        worker.signals.failed.connect(self._on_compute_failed)
+        self._compute_worker = worker  # keep the signals object alive until delivery
+        self.btn_compute.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_compute_done(self, generation: int, result):
+        if generation != self._compute_generation:
+            return  # superseded by a newer compute
+        self.btn_compute.setEnabled(True)
+        per, summ, cat = result
         try:
-            if not self.samples_path or not self.limits_path:
-                if not auto:
-                    QMessageBox.warning(self, "Missing input", "Please select both Samples and Limits files.")
-                return
-            samples = load_samples(self.samples_path)
-            limits  = load_limits(self.limits_path)
-            cat = None if self.cat_combo.currentIndex() <= 0 else self.cat_combo.currentText().strip()
-            per, summ = compute_sof(
-                samples, limits, cat,
-                combine_duplicates=self.chk_combine.isChecked(),
-                treat_missing_as_zero=self.chk_missing_zero.isChecked(),
-                display_sigfigs=int(self.spin_sig.value()),
-            )
             self.per_nuclide_df = per
             self.summary = summ
             self.populate_ui()
@@ -528,6 +725,12 @@ class SofQt(QWidget):
             traceback.print_exc()
             QMessageBox.critical(self, "Error", f"{type(e).__name__}: {e}")
 
+    def _on_compute_failed(self, generation: int, message: str):
+        if generation != self._compute_generation:
+            return
+        self.btn_compute.setEnabled(True)
+        QMessageBox.critical(self, "Error", message)
+
     def _banner_colors(self, passed: bool, sof_total: float, warn_threshold: float) -> tuple[str, str]:
         """
         3-state banner:
@@ -542,8 +745,14 @@ class SofQt(QWidget):
         return "#1b5e20", "white"          # green
     
 
-    def populate_ui(self):
-        
+    def _on_warn_changed(self, *args):
+        # Only after a result exists (as before); load_settings also lands here
+        if self.summary is not None:
+            self._refresh_banner()
+            self.save_settings()
+
+    def _refresh_banner(self):
+        """Summary text + 3-state color; touches only lbl_summary."""
         s = self.summary or {}
         self.lbl_summary.setText(
             f"SOF: {s.get('sof_total', float('nan')):.4g}   "
@@ -560,58 +769,15 @@ class SofQt(QWidget):
             f"padding: 10px; border-radius: 8px; background-color: {bg}; color: {fg};"
         )
 
-        df = self.per_nuclide_df if self.per_nuclide_df is not None else pd.DataFrame()
-        cols = ["nuclide","conc_display","limit_display","fraction","fraction_sigma","allowed_additional_in_limit_units"]
-
-        # Remember current sort state (so user click persists)
-        header = self.table.horizontalHeader()
-        prev_col = header.sortIndicatorSection()
-        prev_ord = header.sortIndicatorOrder()
-
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(len(df))
-
-        for r in range(len(df)):
-            for c, col in enumerate(cols):
-                val = df.iloc[r][col]
-
-                if col in ("fraction", "fraction_sigma", "allowed_additional_in_limit_units"):
-                    # numeric with pretty text
-                    if col == "fraction" and "fraction_display" in df.columns:
-                        txt = str(df.iloc[r]["fraction_display"])
-                        try:
-                            vfloat = float(df.iloc[r]["fraction"])
-                        except Exception:
-                            vfloat = float("nan")
-                    else:
-                        try:
-                            vfloat = float(val)
-                            txt = "" if (isinstance(vfloat, float) and math.isnan(vfloat)) else f"{vfloat:.4g}"
-                        except Exception:
-                            vfloat, txt = float("nan"), ""
-                    self.table.setItem(r, c, NumericItem(vfloat, txt))
-
-                elif col in ("conc_display", "limit_display"):
-                    # parse number for sorting; prefer raw numeric columns if present
-                    txt = "" if pd.isna(val) else str(val)
-                    if col == "conc_display" and "value_conv" in df.columns:
-                        vfloat = float(df.iloc[r]["value_conv"])
-                    elif col == "limit_display" and "limit_value_base" in df.columns:
-                        vfloat = float(df.iloc[r]["limit_value_base"])
-                    else:
-                        vfloat = _num_from_display(txt)
-                    self.table.setItem(r, c, NumericItem(vfloat, txt))
+    def populate_ui(self):
+        import pandas as pd
 
-                else:
-                    # plain text (nuclide)
-                    item = QTableWidgetItem("" if pd.isna(val) else str(val))
-                    self.table.setItem(r, c, item)
+        self._refresh_banner()
 
-        self.table.setSortingEnabled(True)
+        df = self.per_nuclide_df if self.per_nuclide_df is not None else pd.DataFrame()
 
-        # restore previous sort (if any)
-        if prev_col >= 0:
-            self.table.sortItems(prev_col, prev_ord)
+        # One model reset; the model keeps (and re-applies) the user's sort column
+        self.table_model.set_frame(df)
 
         self.btn_save_csv.setEnabled(not df.empty)
         self.btn_save_audit.setEnabled(self.summary is not None)
@@ -633,6 +799,7 @@ class SofQt(QWidget):
         path, _ = QFileDialog.getSaveFileName(self, "Save Audit JSON", "audit.json", "JSON (*.json)")
         if path:
             cat = None if self.cat_combo.currentIndex() <= 0 else self.cat_combo.currentText().strip()
+            from sof_app.services.audit import write_audit
             write_audit(
                 path,
                 inputs={
@@ -0,0 +1,27 @@
+﻿import os
+from sof_app.services.aliases import canonicalize
+
+def test_alias_file_edits_are_picked_up(tmp_path, monkeypatch):
+    p = tmp_path / "aliases.csv"
+    p.write_text("alias,canonical\nradiocaesium,Cs-137\n", encoding="utf-8")
+    monkeypatch.setenv("SOF_ALIAS_PATH", str(p))
+    assert canonicalize("Radiocaesium") == ("Cs-137", True)
+
+    p.write_text("alias,canonical\nradiocaesium,Cs-134\n", encoding="utf-8")
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert canonicalize("Radiocaesium") == ("Cs-134", True)
+
+def test_regex_fallback_when_not_aliased():
+    assert canonicalize("Zz-12") == ("Zz-12", False)
+
+def test_explicit_sources_key_skips_stat(monkeypatch):
+    from sof_app.services import aliases
+    key = aliases.alias_sources_key()
+
+    def _no_stat():
+        raise AssertionError("alias files stat'ed despite explicit key")
+
+    monkeypatch.setattr(aliases, "alias_sources_key", _no_stat)
+    assert canonicalize("Zz-12", key) == ("Zz-12", False)
+    assert canonicalize("Qq-99", key) == ("Qq-99", False)
@@ -0,0 +1,44 @@
+﻿import hashlib, json
+from sof_app.services.audit import _sha256_file, write_audit
+
+def test_sha256_file_matches_hashlib(tmp_path):
+    p = tmp_path / "limits.csv"
+    p.write_bytes(b"nuclide,limit_value,limit_unit\nCs-137,2,Bq/g\n" * 1000)
+    info = _sha256_file(p)
+    assert info["exists"] is True
+    assert info["size_bytes"] == p.stat().st_size
+    assert info["sha256"] == hashlib.sha256(p.read_bytes()).hexdigest()
+
+def test_sha256_file_missing(tmp_path):
+    info = _sha256_file(tmp_path / "nope.csv")
+    assert info["exists"] is False and info["sha256"] is None
+
+def test_write_audit_roundtrip(tmp_path):
+    out = tmp_path / "audit" / "audit.json"
+    summary = {"sof_total": 0.5, "sof_sigma": None, "pass_limit": True, "margin_to_1": 0.5}
+    write_audit(out, inputs={"options": {"warn_threshold": 0.9}}, results={"summary": summary})
+    doc = json.loads(out.read_text(encoding="utf-8"))
+    assert doc["sof_summary"]["sof_total"] == 0.5
+    assert doc["sof_summary"]["warn_threshold"] == 0.9
+    assert doc["file_integrity"]["aliases"] is None
+
+def test_write_audit_numpy_and_timestamp(tmp_path):
+    import numpy as np
+    out = tmp_path / "audit.json"
+    summary = {"sof_total": np.float64(0.25), "pass_limit": np.bool_(True)}
+    write_audit(out, inputs={}, results={"summary": summary})
+    doc = json.loads(out.read_text(encoding="utf-8"))
+    assert doc["sof_summary"]["sof_total"] == 0.25
+    assert doc["sof_summary"]["pass_limit"] is True
+    assert doc["timestamp"].endswith("+00:00")
+
+def test_sha256_file_rehashes_after_edit(tmp_path):
+    import os
+    p = tmp_path / "samples.csv"
+    p.write_bytes(b"a,b\n1,2\n")
+    first = _sha256_file(p)["sha256"]
+    assert _sha256_file(p)["sha256"] == first
+    p.write_bytes(b"a,b\n1,3\n")
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _sha256_file(p)["sha256"] == hashlib.sha256(b"a,b\n1,3\n").hexdigest()
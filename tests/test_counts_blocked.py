@@ -9,3 +9,16 @@ def test_counts_units_blocked_parse():
 def test_counts_units_blocked_convert():
     with pytest.raises(Exception):
         convert_to(Q_(1, "Bq"), "counts")
+
+def test_counts_units_detected_in_samples():
+    import pandas as pd
+    from sof_app.services.sof import compute_sof
+    from sof_app.core.exceptions import CountsUnitDetectedError
+    samples = pd.DataFrame({
+        "nuclide": ["Cs-137", "Co-60", "Sr-90"],
+        "value": [1.0, 2.0, 3.0],
+        "unit": ["cpm", "Bq/g", "counts/min"],
+    })
+    limits = pd.DataFrame({"nuclide": ["Cs-137"], "limit_value": [2.0], "limit_unit": ["Bq/g"]})
+    with pytest.raises(CountsUnitDetectedError, match="counts/min, cpm"):
+        compute_sof(samples, limits)
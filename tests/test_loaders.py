@@ -0,0 +1,44 @@
+﻿import pandas as pd
+import pytest
+from sof_app.io.excel_loader import load_samples, load_limits
+
+def _samples_frame():
+    return pd.DataFrame({
+        "Isotope": ["Cs-137", "Co-60"],
+        "Result": [1.0, 2.0],
+        "Units": ["Bq/g", "Bq/g"],
+        "Analyst": ["A", "B"],   # unknown column, should be ignored
+    })
+
+def test_load_samples_csv_ignores_unknown_columns(tmp_path):
+    p = tmp_path / "samples.csv"
+    _samples_frame().to_csv(p, index=False)
+    df = load_samples(p)
+    assert list(df.columns) == ["nuclide", "value", "unit"]
+    assert df["value"].tolist() == [1.0, 2.0]
+
+def test_load_limits_xlsx(tmp_path):
+    pytest.importorskip("openpyxl")
+    p = tmp_path / "limits.xlsx"
+    pd.DataFrame({
+        "nuclide": ["Cs-137"], "limit": [2.0], "unit": ["Bq/g"],
+        "category": ["General"], "comments": ["x"],
+    }).to_excel(p, index=False)
+    df = load_limits(p)
+    assert list(df.columns) == ["nuclide", "limit_value", "limit_unit", "category"]
+    assert df.loc[0, "limit_value"] == 2.0
+
+def test_load_limits_xlsx_buffer(tmp_path):
+    import io
+    pytest.importorskip("openpyxl")
+    buf = io.BytesIO()
+    pd.DataFrame({"nuclide": ["Co-60"], "limit_value": [4.0], "limit_unit": ["Bq/g"]}).to_excel(buf, index=False)
+    buf.seek(0)
+    df = load_limits(buf, format="excel")
+    assert df.loc[0, "nuclide"] == "Co-60"
+
+def test_named_upload_sniffed_by_suffix():
+    import io
+    buf = io.BytesIO(b"nuclide,value,unit\nCs-137,1,Bq/g\n")
+    buf.name = "samples.CSV"
+    assert load_samples(buf)["value"].tolist() == [1]
@@ -6,3 +6,10 @@ def test_canonical_forms():
     assert to_canonical("Cs-137") == "Cs-137"
     assert to_canonical("99mTc") == "Tc-99m"
     assert to_canonical("TC99M") == "Tc-99m"
+
+def test_canonical_isomer_and_fallback_forms():
+    assert to_canonical("tc-99M") == "Tc-99m"
+    assert to_canonical("Am242m1") == "Am-242m1"
+    assert to_canonical("242mAm") == "Am-242m"
+    assert to_canonical("H 3") == "H-3"
+    assert to_canonical("Pu239/240") == "Pu239/240"
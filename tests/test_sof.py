@@ -28,3 +28,111 @@ def test_mixed_units():
     })
     per, summary = compute_sof(samples, limits)
     assert abs(summary["sof_total"] - 0.5) < 1e-12
+
+def test_unit_mismatch_raises():
+    import pytest
+    from sof_app.core.exceptions import UnitMismatchError
+    samples = pd.DataFrame({"nuclide": ["Cs-137"], "value": [1.0], "unit": ["mrem"]})
+    limits = pd.DataFrame({"nuclide": ["Cs-137"], "limit_value": [2.0], "limit_unit": ["Bq/g"]})
+    with pytest.raises(UnitMismatchError):
+        compute_sof(samples, limits)
+
+def test_sigma_propagation():
+    samples = pd.DataFrame({
+        "nuclide": ["Cs-137", "Co-60"],
+        "value": [1.0, 3.0],
+        "unit": ["Bq/g", "Bq/g"],
+        "sigma": [0.2, None],
+    })
+    limits = pd.DataFrame({
+        "nuclide": ["Cs-137", "Co-60"],
+        "limit_value": [2.0, 6.0],
+        "limit_unit": ["Bq/g", "Bq/g"],
+    })
+    per, summary = compute_sof(samples, limits)
+    assert abs(summary["sof_total"] - 1.0) < 1e-12
+    assert abs(summary["sof_sigma"] - 0.1) < 1e-12
+    assert per.set_index("nuclide")["fraction_sigma"].isna()["Co-60"]
+
+def test_sof_kernel_matches_reference():
+    import numpy as np
+    from sof_app.services import sof
+    v = np.array([1.0, 2.0, np.nan, 4.0])
+    L = np.array([2.0, 4.0, 1.0, 8.0])
+    s = np.array([0.1, np.nan, 0.3, 0.4])
+    ref = sof._sof_kernel_py(v, L, s)
+    got = sof._sof_kernel(v, L, s)
+    for a, b in zip(ref, got):
+        np.testing.assert_allclose(a, b, rtol=1e-12)
+    assert abs(got[3] - 1.5) < 1e-12
+
+def test_group_sums_matches_reference():
+    import numpy as np
+    from sof_app.services import sof
+    codes = np.array([0, 1, 0, 2, 1], dtype=np.intp)
+    v = np.array([1.0, 2.0, np.nan, 4.0, 3.0])
+    s = np.array([0.3, np.nan, 0.4, np.nan, 0.5])
+    ref = sof._group_sums_py(codes, v, s, 3)
+    got = sof._group_sums(codes, v, s, 3)
+    for a, b in zip(ref, got):
+        np.testing.assert_allclose(a, b, rtol=1e-12)
+    np.testing.assert_allclose(got[0], [1.0, 5.0, 4.0])
+    np.testing.assert_array_equal(got[2], [2, 1, 0])
+
+def test_combine_duplicates_sums_values_and_sigma():
+    samples = pd.DataFrame({
+        "nuclide": ["Cs-137", "cs137", "Co-60"],
+        "value": [1.0, 2.0, 1.0],
+        "unit": ["Bq/g", "Bq/g", "Bq/g"],
+        "sigma": [0.3, 0.4, None],
+    })
+    limits = pd.DataFrame({
+        "nuclide": ["Cs-137", "Co-60"],
+        "limit_value": [10.0, 4.0],
+        "limit_unit": ["Bq/g", "Bq/g"],
+    })
+    per, summary = compute_sof(samples, limits)
+    assert per["nuclide"].tolist() == ["Co-60", "Cs-137"]
+    cs = per.set_index("nuclide").loc["Cs-137"]
+    assert abs(cs["fraction"] - 0.3) < 1e-12
+    assert abs(cs["fraction_sigma"] - 0.05) < 1e-12
+    assert abs(summary["sof_total"] - 0.55) < 1e-12
+
+def test_blank_unit_rejected():
+    import pytest
+    samples = pd.DataFrame({"nuclide": ["Cs-137"], "value": [1.0], "unit": [None]})
+    limits = pd.DataFrame({"nuclide": ["Cs-137"], "limit_value": [2.0], "limit_unit": ["Bq/g"]})
+    with pytest.raises(ValueError, match="Blank unit"):
+        compute_sof(samples, limits)
+
+def test_inputs_not_mutated():
+    samples = pd.DataFrame({"nuclide": ["cs137"], "value": [1.0], "unit": ["Bq/g"]})
+    limits = pd.DataFrame({"nuclide": ["Cs-137"], "limit_value": [2.0], "limit_unit": ["Bq/g"]})
+    s_before, l_before = samples.copy(), limits.copy()
+    compute_sof(samples, limits)
+    pd.testing.assert_frame_equal(samples, s_before)
+    pd.testing.assert_frame_equal(limits, l_before)
+
+def test_missing_limits_dropped_or_raised():
+    import pytest
+    from sof_app.core.exceptions import NuclideNotFoundError
+    samples = pd.DataFrame({"nuclide": ["Cs-137", "Xx-1"], "value": [1.0, 5.0], "unit": ["Bq/g", "Bq/g"]})
+    limits = pd.DataFrame({"nuclide": ["Cs-137"], "limit_value": [2.0], "limit_unit": ["Bq/g"]})
+    per, summary = compute_sof(samples, limits)
+    assert list(per["nuclide"]) == ["Cs-137"]
+    assert summary["missing_limit_for_samples"] == ["Xx-1"]
+    per, summary = compute_sof(samples.iloc[1:], limits)
+    assert per.empty and summary["sof_total"] == 0.0
+    with pytest.raises(NuclideNotFoundError, match="Xx-1"):
+        compute_sof(samples, limits, treat_missing_as_zero=False)
+
+def test_duplicate_blank_limits_reported():
+    import pytest
+    samples = pd.DataFrame({"nuclide": ["Cs-137"], "value": [1.0], "unit": ["Bq/g"]})
+    limits = pd.DataFrame({
+        "nuclide": ["Cs-137", None, None],
+        "limit_value": [2.0, 3.0, 4.0],
+        "limit_unit": ["Bq/g", "Bq/g", "Bq/g"],
+    })
+    with pytest.raises(ValueError, match="<blank>"):
+        compute_sof(samples, limits)
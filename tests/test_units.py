@@ -78,3 +78,73 @@ def test_list_units_categories_have_expected_members():
     assert "mrem" in list_units("dose")
     assert "uSv/h" in list_units("dose_rate")
     assert "yr" in list_units("time")
+
+# Literal expected values: checks the factor table even where pint is absent
+@pytest.mark.parametrize(
+    "value,unit,target,expected",
+    [
+        (600, "dpm/100 cm^2", "Bq/m^2", 600 / 60 / 0.01),
+        (1.0, "Bq/g", "Bq/kg", 1000.0),
+        (2.5, "mCi", "MBq", 2.5 * 37.0),
+        (100, "µSv/h", "mrem/h", 10.0),
+        (3.0, "nCi/L", "Bq/mL", 3.0 * 37.0 / 1000.0),
+        (1.0, "yr", "h", 8766.0),
+        (2.0, "kCi", "Bq", 2.0 * 3.7e13),
+        (3.0, "hours", "s", 10800.0),
+        (2.0, "days", "h", 48.0),
+        (5.0, "mSv/a", "uSv/h", 5.0e3 / 8766.0),
+        (1.0, "Bq/cc", "Bq/m^3", 1e6),
+        (1.0, "Bq/dm^3", "Bq/L", 1.0),
+        (1.0, "Bq/t", "Bq/kg", 1e-3),
+        (1.0, "Bq/ft^2", "Bq/m^2", 1.0 / 0.3048**2),
+        (1.0, "Bq/(kg)", "Bq/g", 1e-3),
+        (1.0, "Bq/(m^2*s)", "Bq/cm^2/min", 60.0 / 1e4),
+        (50.0, "ppm", "%", 5e-3),
+        (2.0, "%", "ppm", 2e4),
+        (1.0, "millicuries", "MBq", 37.0),
+    ],
+)
+def test_factor_table_literal_values(value, unit, target, expected):
+    from sof_app.core import units
+    dim_s, f_s = units.unit_factor(unit)
+    dim_t, f_t = units.unit_factor(target)
+    assert dim_s == dim_t
+    assert math.isclose(value * f_s / f_t, expected, rel_tol=1e-12)
+
+@pytest.mark.parametrize(
+    "value,unit,target",
+    [
+        (600, "dpm/100 cm^2", "Bq/m^2"),
+        (1.0, "Bq/g", "Bq/kg"),
+        (2.5, "mCi", "MBq"),
+        (100, "µSv/h", "mrem/h"),
+        (3.0, "nCi/L", "Bq/mL"),
+        (1.0, "yr", "h"),
+        (2.0, "kCi", "Bq"),
+        (3.0, "hours", "s"),
+        (2.0, "days", "h"),
+        (5.0, "mSv/a", "uSv/h"),
+        (1.0, "Bq/cc", "Bq/m^3"),
+        (1.0, "Bq/dm^3", "Bq/L"),
+        (1.0, "Bq/t", "Bq/kg"),
+        (1.0, "Bq/ft^2", "Bq/m^2"),
+        (1.0, "Bq/(kg)", "Bq/g"),
+        (1.0, "Bq/(m^2*s)", "Bq/cm^2/min"),
+        (50.0, "ppm", "%"),
+        (2.0, "%", "ppm"),
+        (1.0, "millicuries", "MBq"),
+    ],
+)
+def test_factor_table_matches_pint(value, unit, target):
+    pytest.importorskip("pint")
+    from sof_app.core import units
+    expected = units._pint_convert_to(units._pint_parse_quantity(value, unit), target).magnitude
+    got = convert_to(parse_quantity(value, unit), target).magnitude
+    assert math.isclose(got, expected, rel_tol=RTOL)
+
+def test_factor_table_rejects_unknown_units():
+    from sof_app.core import units
+    with pytest.raises(ValueError):
+        units._table_quantity(1.0, "Bq/furlong")
+    with pytest.raises(ValueError):
+        units._table_quantity(1.0, "Bq/(kg")